@@ -10,10 +10,28 @@ from analyze_pcb import analyze_pcb_image
 if not os.path.exists('data'):
     import setup
     setup.create_directory_structure()
-    setup.create_sample_dataset()
-    setup.create_dummy_images()
+    df = setup.create_sample_dataset()
+    # Rendered serially: forking worker processes from Streamlit's
+    # multi-threaded server is not safe
+    setup.create_dummy_images(df, parallel=False)
     setup.create_dummy_models()
 
+# Analysis options shown in the sidebar, mapped to the option number
+# expected by analyze_pcb_image
+ANALYSIS_OPTIONS = {
+    "1. Check Certification & Quality Check": 1,
+    "2. Quality Check Required": 2,
+    "3. Certification Needed": 3
+}
+# Option numbers whose results include each field
+_SHOWS_QUALITY = frozenset({1, 2})
+_SHOWS_CERTIFICATION = frozenset({1, 3})
+
+@st.cache_data(show_spinner=False)
+def run_analysis(image_bytes, analysis_option):
+    """Analyze an uploaded image, cached on its contents and the selected option."""
+    return analyze_pcb_image(image_bytes, analysis_option)
+
 # --- Streamlit Application Layout ---
 st.set_page_config(
     page_title="PCB Analysis Tool",
@@ -27,23 +45,12 @@ st.markdown("Upload a PCB image and select the analysis type.")
 st.sidebar.header("Analysis Options")
 analysis_option = st.sidebar.radio(
     "Choose analysis type:",
-    options=[
-        "1. Check Certification & Quality Check",
-        "2. Quality Check Required",
-        "3. Certification Needed"
-    ],
+    options=list(ANALYSIS_OPTIONS),
     index=0 # Default to the first option
 )
 
 # Convert string option to integer for the function
-if "1." in analysis_option:
-    selected_option_int = 1
-elif "2." in analysis_option:
-    selected_option_int = 2
-elif "3." in analysis_option:
-    selected_option_int = 3
-else:
-    selected_option_int = 0 # Fallback
+selected_option_int = ANALYSIS_OPTIONS.get(analysis_option, 0) # 0 is the fallback
 
 uploaded_file = st.file_uploader("Choose a PCB image...", type=["jpg", "jpeg", "png", "bmp"])
 
@@ -56,14 +63,11 @@ if uploaded_file is not None:
     st.subheader("Analysis Results:")
     with st.spinner("Analyzing PCB image..."):
         # Perform analysis using the analyze_pcb_image function
-        results = analyze_pcb_image(image_bytes, selected_option_int)
+        results = run_analysis(image_bytes, selected_option_int)
 
-        if selected_option_int == 1:
-            st.write(f"**Quality Check Required:** {results['quality_check_required']}")
-            st.write(f"**Certification Needed:** {results['certification_needed']}")
-        elif selected_option_int == 2:
+        if selected_option_int in _SHOWS_QUALITY:
             st.write(f"**Quality Check Required:** {results['quality_check_required']}")
-        elif selected_option_int == 3:
+        if selected_option_int in _SHOWS_CERTIFICATION:
             st.write(f"**Certification Needed:** {results['certification_needed']}")
 
         st.markdown(f"---")
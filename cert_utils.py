@@ -1,23 +1,57 @@
+import functools
+import re
+import numpy as np
+
+# Finds every keyword in one pass over the name; the lookahead lets matches
+# overlap, so the result is the same as testing each keyword separately
+_KEYWORD_PATTERN = re.compile(r'(?=(consumer|electronics|industrial|power|medical|automotive))')
+
+# Common certs by PCB use-case, as (keywords, certifications) pairs
+_RULES = (
+    (frozenset({'consumer', 'electronics'}), frozenset({'CE', 'RoHS', 'UL'})),
+    (frozenset({'industrial', 'power'}), frozenset({'CE', 'RoHS', 'UL', 'ISO 9001'})),
+    (frozenset({'medical'}), frozenset({'CE (Medical)', 'ISO 13485', 'FDA', 'RoHS'})),
+    (frozenset({'automotive'}), frozenset({'ISO / TS 16949', 'CE', 'RoHS'})),
+)
+# Suggested when no keyword matches
+_DEFAULT_CERTIFICATIONS = ('CE', 'RoHS')
+
+# The rules flattened into a (keyword, certification) matrix, so a batch of
+# names is classified with one matrix product; a name requires a cert when
+# any of its keywords does, which is the boolean product with its keyword row
+_CERTIFICATIONS = tuple(sorted(frozenset().union(*(certs for _, certs in _RULES))))
+_KEYWORD_INDEX = {keyword: i for i, keyword in enumerate(sorted(frozenset().union(*(keywords for keywords, _ in _RULES))))}
+_KEYWORD_CERTIFICATIONS = np.array([
+    [any(keyword in keywords and cert in certs for keywords, certs in _RULES) for cert in _CERTIFICATIONS]
+    for keyword in _KEYWORD_INDEX
+], dtype=bool)
+
+@functools.lru_cache(maxsize=512)
 def required_certifications(pcb_name):
     """
     Determines required certifications based on PCB name keywords.
+    Returns a sorted tuple; cached per name, as the result only depends on it.
     """
-    name_lower = pcb_name.lower()
-    required = []
-
-    # Common certs by PCB use-case
-    if 'consumer' in name_lower or 'electronics' in name_lower:
-        required += ['CE', 'RoHS', 'UL']
-    if 'industrial' in name_lower or 'power' in name_lower:
-        required += ['CE', 'RoHS', 'UL', 'ISO 9001']
-    if 'medical' in name_lower:
-        required += ['CE (Medical)', 'ISO 13485', 'FDA', 'RoHS']
-    if 'automotive' in name_lower:
-        required += ['ISO / TS 16949', 'CE', 'RoHS']
+    keywords = set(_KEYWORD_PATTERN.findall(pcb_name.lower()))
+    required = frozenset().union(*(certs for rule_keywords, certs in _RULES if rule_keywords & keywords))
 
     # If nothing matched, suggest general
     if not required:
-        required = ['CE', 'RoHS']
+        return _DEFAULT_CERTIFICATIONS
+
+    return tuple(sorted(required))
 
-    # Deduplicate
-    return sorted(set(required))
+def required_certifications_batch(pcb_names):
+    """
+    Determines required certifications for many PCB names at once.
+    Returns a list with the same sorted tuple per name as required_certifications.
+    """
+    pcb_names = list(pcb_names)
+    matches = np.zeros((len(pcb_names), len(_KEYWORD_INDEX)), dtype=bool)
+    for row, pcb_name in enumerate(pcb_names):
+        for keyword in _KEYWORD_PATTERN.findall(pcb_name.lower()):
+            matches[row, _KEYWORD_INDEX[keyword]] = True
+    required = matches @ _KEYWORD_CERTIFICATIONS
+
+    # If nothing matched, suggest general
+    return [tuple(_CERTIFICATIONS[i] for i in np.flatnonzero(row)) or _DEFAULT_CERTIFICATIONS for row in required]
@@ -1,28 +1,75 @@
+import streamlit as st
 from PIL import Image
 import io
+import struct
 
-def check_image_quality(uploaded_file):
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# JPEG start-of-frame markers (SOF0-SOF15, except DHT, JPG and DAC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# JPEG markers that stand alone, without a length field
+_JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xD9)) | {0x01}
+# Formats accepted without a warning (PIL reports .jpg files as 'JPEG')
+_SUPPORTED_FORMATS = frozenset({'PNG', 'JPEG'})
+
+def _read_image_header(data):
+    """
+    Reads format and dimensions from PNG/JPEG header bytes, without decoding pixels.
+    Returns (format, width, height), or None if the header is not recognised.
+    """
+    # PNG and JPEG are both identified from the first 24 bytes
+    head = data[:24]
+    if head[:8] == _PNG_SIGNATURE and head[12:16] == b'IHDR':
+        width, height = struct.unpack_from('>II', head, 16)
+        return 'PNG', width, height
+    if head[:2] == b'\xff\xd8':
+        # Walk the segments up to the first frame header, reading only the
+        # marker and length fields; skipping whole segments also avoids
+        # matching markers inside e.g. an EXIF thumbnail
+        pos = 2
+        while pos + 4 <= len(data):
+            if data[pos] != 0xFF:
+                return None
+            marker = data[pos + 1]
+            if marker == 0xFF:
+                pos += 1
+            elif marker in _JPEG_STANDALONE_MARKERS:
+                pos += 2
+            elif marker in _JPEG_SOF_MARKERS:
+                if pos + 9 > len(data):
+                    return None
+                height, width = struct.unpack_from('>HH', data, pos + 5)
+                return 'JPEG', width, height
+            else:
+                pos += 2 + struct.unpack_from('>H', data, pos + 2)[0]
+    return None
+
+@st.cache_data(show_spinner=False)
+def check_image_quality(raw_bytes):
     """
     Basic checks: format, resolution, aspect ratio, file size.
-    Returns a dict of results.
+    Takes the raw bytes of the uploaded file and returns a dict of results.
+    Cached on the file contents, so Streamlit reruns with the same upload
+    do not parse it again.
     """
     result = {}
-    # Read image
-    img = Image.open(uploaded_file)
-    result['format'] = img.format
-    result['width'], result['height'] = img.size
+    # Read format and size from the header; only fall back to PIL
+    # (which still does not decode pixels) for other formats
+    header = _read_image_header(raw_bytes)
+    if header is None:
+        img = Image.open(io.BytesIO(raw_bytes))
+        header = img.format, img.size[0], img.size[1]
+    result['format'], result['width'], result['height'] = header
     # File size
-    uploaded_file.seek(0, io.SEEK_END)
-    size_kb = uploaded_file.tell() / 1024
+    size_kb = len(raw_bytes) / 1024
     result['size_kb'] = round(size_kb, 2)
     # Aspect ratio check (square or rectangular)
     result['aspect_ratio'] = round(result['width'] / result['height'], 2)
     # Simple warnings
     result['warnings'] = []
-    if result['format'] not in ['PNG', 'JPEG', 'JPG']:
+    if result['format'] not in _SUPPORTED_FORMATS:
         result['warnings'].append('Unsupported format. Use PNG or JPEG.')
     if result['width'] < 800 or result['height'] < 600:
         result['warnings'].append('Low resolution: should be at least 800×600.')
     if size_kb > 5000:
-        result['warnings'].append('File size large: optimize to <5 MB.')
-    return img, result
+        result['warnings'].append('File size large: optimize to <5 MB.')
+    return result
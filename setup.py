@@ -1,116 +1,145 @@
 # setup.py
 import os
+from pathlib import Path
 import pandas as pd
 import numpy as np
-from PIL import Image, ImageDraw
-import json
+from PIL import Image
+import orjson
+from concurrent.futures import ProcessPoolExecutor
 
 def create_directory_structure():
     """Create the necessary directory structure for the project."""
-    os.makedirs("data", exist_ok=True)
-    os.makedirs("models", exist_ok=True)
-    os.makedirs("dataset", exist_ok=True)
+    for directory in ("data", "models"):
+        Path(directory).mkdir(exist_ok=True)
     
-    # Create PCB type directories
+    # Create PCB type directories; parents=True creates "dataset" itself
+    # along with the first of them
     pcb_types = [
         "single_sided", "double_sided", "multilayer",
         "flexible", "rigid_flex", "high_frequency", "high_power"
     ]
     
+    dataset_dir = Path("dataset")
     for pcb_type in pcb_types:
-        os.makedirs(f"dataset/{pcb_type}", exist_ok=True)
+        (dataset_dir / pcb_type).mkdir(parents=True, exist_ok=True)
         
     print("Directory structure created successfully!")
 
 def create_sample_dataset():
-    """Create a sample PCB dataset CSV file."""
-    data = [
-        ["PCB001", "dataset/single_sided/PCB001.jpg", "single_sided", "low", 1, "basic", "CE", "none", "consumer_electronics", "FR-4", "none"],
-        ["PCB002", "dataset/single_sided/PCB002.jpg", "single_sided", "medium", 1, "enhanced", "CE;RoHS", "solder_bridge", "consumer_electronics", "FR-4", "none"],
-        ["PCB003", "dataset/single_sided/PCB003.jpg", "single_sided", "low", 1, "basic", "CE", "open_circuit", "toys", "FR-4", "none"],
-        ["PCB004", "dataset/double_sided/PCB004.jpg", "double_sided", "medium", 2, "enhanced", "CE;RoHS;UL", "none", "industrial_control", "FR-4", "none"],
-        ["PCB005", "dataset/double_sided/PCB005.jpg", "double_sided", "high", 2, "comprehensive", "CE;RoHS;UL;FCC", "solder_quality", "medical_non_critical", "FR-4", "none"],
-        ["PCB006", "dataset/multilayer/PCB006.jpg", "multilayer", "high", 4, "comprehensive", "CE;RoHS;UL;FCC", "none", "telecommunications", "FR-4", "impedance_control"],
-        ["PCB007", "dataset/flexible/PCB007.jpg", "flexible", "medium", 2, "enhanced", "CE;RoHS;UL", "none", "wearables", "Polyimide", "flex_durability"]
-    ]
-    
-    columns = [
-        "image_id", "image_path", "pcb_type", "components_density", "layer_count", 
-        "quality_check_required", "certification_needed", "defect_type", 
-        "intended_application", "material_type", "special_features"
-    ]
+    """Create a sample PCB dataset CSV file and return the dataset."""
+    # Built column by column with explicit dtypes, so pandas does not have to
+    # infer a type for every cell; low-cardinality labels are categoricals
+    data = {
+        "image_id": ["PCB001", "PCB002", "PCB003", "PCB004", "PCB005", "PCB006", "PCB007"],
+        "image_path": ["dataset/single_sided/PCB001.jpg", "dataset/single_sided/PCB002.jpg", "dataset/single_sided/PCB003.jpg", "dataset/double_sided/PCB004.jpg", "dataset/double_sided/PCB005.jpg", "dataset/multilayer/PCB006.jpg", "dataset/flexible/PCB007.jpg"],
+        "pcb_type": pd.Categorical(["single_sided", "single_sided", "single_sided", "double_sided", "double_sided", "multilayer", "flexible"]),
+        "components_density": pd.Categorical(["low", "medium", "low", "medium", "high", "high", "medium"]),
+        "layer_count": np.array([1, 1, 1, 2, 2, 4, 2], dtype=np.int8),
+        "quality_check_required": pd.Categorical(["basic", "enhanced", "basic", "enhanced", "comprehensive", "comprehensive", "enhanced"]),
+        "certification_needed": ["CE", "CE;RoHS", "CE", "CE;RoHS;UL", "CE;RoHS;UL;FCC", "CE;RoHS;UL;FCC", "CE;RoHS;UL"],
+        "defect_type": ["none", "solder_bridge", "open_circuit", "none", "solder_quality", "none", "none"],
+        "intended_application": ["consumer_electronics", "consumer_electronics", "toys", "industrial_control", "medical_non_critical", "telecommunications", "wearables"],
+        "material_type": pd.Categorical(["FR-4", "FR-4", "FR-4", "FR-4", "FR-4", "FR-4", "Polyimide"]),
+        "special_features": ["none", "none", "none", "none", "none", "impedance_control", "flex_durability"]
+    }
     
-    df = pd.DataFrame(data, columns=columns)
+    df = pd.DataFrame(data)
     os.makedirs("data", exist_ok=True)
     df.to_csv("data/pcb_dataset.csv", index=False)
     print("Sample dataset CSV created successfully!")
+    return df
 
-def create_dummy_images():
-    """Create dummy PCB images for demonstration."""
-    try:
-        df = pd.read_csv("data/pcb_dataset.csv")
-    except FileNotFoundError:
-        print("PCB dataset CSV not found. Creating it...")
-        create_sample_dataset()
-        df = pd.read_csv("data/pcb_dataset.csv")
+def _fill_rectangle(pixels, box, fill=None, outline=None):
+    """Fill and/or outline a rectangle in an RGB pixel array.
+
+    The box is inclusive on all sides, as with ``ImageDraw.rectangle``.
+    """
+    x0, y0, x1, y1 = box
+    if fill is not None:
+        pixels[y0:y1 + 1, x0:x1 + 1] = fill
+    if outline is not None:
+        pixels[y0, x0:x1 + 1] = outline
+        pixels[y1, x0:x1 + 1] = outline
+        pixels[y0:y1 + 1, x0] = outline
+        pixels[y0:y1 + 1, x1] = outline
+
+def _render_dummy_image(image_id, image_path, pcb_type, components_density):
+    """Render and save the dummy PCB image for one dataset row."""
+    # Create directory if it doesn't exist
+    os.makedirs(os.path.dirname(image_path), exist_ok=True)
     
-    # Create a dummy image for each entry in the dataset
-    for _, row in df.iterrows():
-        image_path = row["image_path"]
-        pcb_type = row["pcb_type"]
-        components_density = row["components_density"]
-        defect_type = row["defect_type"]
-        
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(image_path), exist_ok=True)
-        
-        # Create a colored rectangle as a dummy PCB
-        img = Image.new('RGB', (224, 224), color=(150, 150, 150))
-        draw = ImageDraw.Draw(img)
-        
-        # Draw different patterns based on PCB type
-        if pcb_type == "single_sided":
-            draw.rectangle([20, 20, 204, 204], fill=(130, 130, 130), outline=(200, 200, 200))
-        elif pcb_type == "double_sided":
-            draw.rectangle([20, 20, 204, 204], fill=(120, 120, 120), outline=(200, 200, 200))
-            draw.rectangle([40, 40, 184, 184], fill=(140, 140, 140), outline=(180, 180, 180))
-        elif pcb_type == "multilayer":
-            draw.rectangle([20, 20, 204, 204], fill=(110, 110, 110), outline=(200, 200, 200))
-            for i in range(3):
-                inset = 20 + (i * 20)
-                draw.rectangle(
-                    [inset, inset, 224 - inset, 224 - inset],
-                    outline=(180 - (i * 20), 180 - (i * 20), 180 - (i * 20))
-                )
-        elif pcb_type == "flexible":
-            draw.rectangle([20, 20, 204, 204], fill=(150, 150, 100), outline=(200, 200, 150))
-            # Add curved lines to represent flexibility
-            for i in range(5):
-                y = 50 + (i * 30)
-                for x in range(30, 194, 2):
-                    draw.point((x, y + int(10 * np.sin(x * 0.1))), fill=(180, 180, 130))
-        else:
-            # Default pattern
-            draw.rectangle([20, 20, 204, 204], fill=(130, 130, 130), outline=(200, 200, 200))
-        
-        # Add "components" based on density
-        num_components = {
-            "low": 5,
-            "medium": 15,
-            "high": 30,
-            "very_high": 50
-        }.get(components_density, 10)
-        
-        # Add random "components"
-        np.random.seed(int(row["image_id"].replace("PCB", "")))  # For reproducibility
-        for _ in range(num_components):
-            x, y = np.random.randint(30, 194, 2)
-            size = np.random.randint(5, 15)
-            color = tuple(np.random.randint(50, 150, 3))
-            draw.rectangle([x, y, x + size, y + size], fill=color)
-                
-        # Save the image
-        img.save(image_path)
+    # Create a colored rectangle as a dummy PCB, drawn straight into a
+    # pixel array rather than through ImageDraw
+    pixels = np.full((224, 224, 3), 150, dtype=np.uint8)
+    
+    # Draw different patterns based on PCB type
+    if pcb_type == "single_sided":
+        _fill_rectangle(pixels, (20, 20, 204, 204), fill=(130, 130, 130), outline=(200, 200, 200))
+    elif pcb_type == "double_sided":
+        _fill_rectangle(pixels, (20, 20, 204, 204), fill=(120, 120, 120), outline=(200, 200, 200))
+        _fill_rectangle(pixels, (40, 40, 184, 184), fill=(140, 140, 140), outline=(180, 180, 180))
+    elif pcb_type == "multilayer":
+        _fill_rectangle(pixels, (20, 20, 204, 204), fill=(110, 110, 110), outline=(200, 200, 200))
+        for i in range(3):
+            inset = 20 + (i * 20)
+            _fill_rectangle(
+                pixels, (inset, inset, 224 - inset, 224 - inset),
+                outline=(180 - (i * 20), 180 - (i * 20), 180 - (i * 20))
+            )
+    elif pcb_type == "flexible":
+        _fill_rectangle(pixels, (20, 20, 204, 204), fill=(150, 150, 100), outline=(200, 200, 150))
+        # Add curved lines to represent flexibility: one sine offset per x,
+        # shared by all five lines, set in a single scatter
+        xs = np.arange(30, 194, 2)
+        ys = 50 + 30 * np.arange(5)[:, None] + (10 * np.sin(xs * 0.1)).astype(int)
+        pixels[ys, xs] = (180, 180, 130)
+    else:
+        # Default pattern
+        _fill_rectangle(pixels, (20, 20, 204, 204), fill=(130, 130, 130), outline=(200, 200, 200))
+    
+    # Add "components" based on density
+    num_components = {
+        "low": 5,
+        "medium": 15,
+        "high": 30,
+        "very_high": 50
+    }.get(components_density, 10)
+    
+    # Add random "components": draw all positions, sizes and colors at once,
+    # then fill them in as slices of the pixel array
+    rng = np.random.default_rng(int(image_id.replace("PCB", "")))  # For reproducibility
+    xs, ys = rng.integers(30, 194, (2, num_components))
+    sizes = rng.integers(5, 15, num_components)
+    colors = rng.integers(50, 150, (num_components, 3), dtype=np.uint8)
+    for x, y, size, color in zip(xs, ys, sizes, colors):
+        pixels[y:y + size + 1, x:x + size + 1] = color
+            
+    # Save the image
+    Image.fromarray(pixels).save(image_path)
+
+def create_dummy_images(df=None, parallel=True):
+    """Create dummy PCB images for demonstration, reading the dataset CSV if no dataset is given."""
+    if df is None:
+        try:
+            df = pd.read_csv("data/pcb_dataset.csv")
+        except FileNotFoundError:
+            print("PCB dataset CSV not found. Creating it...")
+            df = create_sample_dataset()
+    
+    # Create a dummy image for each entry in the dataset, fed straight from
+    # the needed columns rather than building a record per row. The images
+    # are independent of each other, so they are rendered in parallel once
+    # there are enough rows to give every worker a share; otherwise starting
+    # the process pool costs more than it saves.
+    columns = ["image_id", "image_path", "pcb_type", "components_density"]
+    values = [df[column].to_numpy() for column in columns]
+    workers = os.cpu_count() or 1
+    if parallel and len(df) >= workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_render_dummy_image, *values, chunksize=len(df) // workers))
+    else:
+        for row in zip(*values):
+            _render_dummy_image(*row)
         
     print(f"Created {len(df)} dummy PCB images!")
 
@@ -120,19 +149,19 @@ def create_dummy_models():
     
     # Create dummy model class names files
     quality_classes = ['basic', 'enhanced', 'comprehensive']
-    with open("models/quality_check_classes.json", "w") as f:
-        json.dump(quality_classes, f)
+    with open("models/quality_check_classes.json", "wb") as f:
+        f.write(orjson.dumps(quality_classes))
     
     cert_classes = ['CE', 'RoHS', 'UL', 'FCC', 'ISO9001', 'IEC60950', 'IATF16949']
-    with open("models/certification_classes.json", "w") as f:
-        json.dump(cert_classes, f)
+    with open("models/certification_classes.json", "wb") as f:
+        f.write(orjson.dumps(cert_classes))
     
     print("Created dummy model class files!")
 
 if __name__ == "__main__":
     print("Setting up Mefron PCB Analyzer...")
     create_directory_structure()
-    create_sample_dataset()
-    create_dummy_images()
+    df = create_sample_dataset()
+    create_dummy_images(df)
     create_dummy_models()
     print("Setup complete!")